@@ -3,20 +3,33 @@ import sys
 from io import StringIO
 from pathlib import Path
 
-from src.preprocess import Normalizer, TokensScanner, Tokenizer, StopWords
+from src.preprocess import Normalizer, TokensScanner, Tokenizer, StopWords, StopWordsFilter, Analyzer
+from src.stemmer import PorterStemmer
 from src.document_collection import DocumentCollection
 from src.positional_index import PositionalIndex
-from src.vector_space import VectorSpace
+from src.vector_space import VectorSpace, PostingsVectorSpace
+from src.query_planner import QueryPlanner
 
 
-def index(collection):
+def index(collection, unified=False, stemming=False):
     scanner = TokensScanner()
     stop_list = StopWords({'in', 'to', 'where'})
-    normalizer = Normalizer()
-    tokenizer = Tokenizer(stop_list, normalizer, scanner)
+    filters = [Normalizer(), StopWordsFilter(stop_list)]
+    if stemming:
+        filters.append(PorterStemmer())
+    # the analyzer is saved with the index, so the queries are analyzed the same way
+    tokenizer = Tokenizer(Analyzer(filters), scanner)
     document_collection = DocumentCollection(collection)
 
     positional_index = PositionalIndex(tokenizer, document_collection)
+    if unified:
+        # a stale 'vector_space' would be preferred over the new index at query time
+        vector_space_path = Path(collection) / "vector_space"
+        if is_valid_file(vector_space_path):
+            os.remove(vector_space_path)
+        positional_index.save("index")
+        print("Indexing is done.")
+        return
     vector_space = VectorSpace(tokenizer, positional_index)
     positional_index.save("index")
     vector_space.save("vector_space")
@@ -30,23 +43,28 @@ def print_index(collection):
     positional_index.print_positional_index()
 
 
-def print_vector_space(collection):
+def load_vector_space(collection, positional_index):
     path = Path(collection) / "vector_space"
-    is_valid_file(path)
-    vector_space = VectorSpace.load(path)
+    if is_valid_file(path):
+        return VectorSpace.load(path)
+    return PostingsVectorSpace(positional_index)
+
+
+def print_vector_space(collection):
+    positional_index = PositionalIndex.load(Path(collection) / "index")
+    vector_space = load_vector_space(collection, positional_index)
     vector_space.print_vector_space()
 
 
-def query(phrase, collection):
+def query(phrase, collection, explain=False):
     positional_index_path = Path(collection) / "index"
-    vector_space_path = Path(collection) / "vector_space"
-    if not is_valid_file(positional_index_path) or not is_valid_file(vector_space_path):
-        print("The 'index' or 'vector_space' are not found, please build the index first.")
+    if not is_valid_file(positional_index_path):
+        print("The index not found, please build the index first.")
         return
     positional_index = PositionalIndex.load(positional_index_path)
-    vector_space = VectorSpace.load(vector_space_path)
-    matched_documents = positional_index.phrase_query(StringIO(phrase))
-    vector_space.query(StringIO(phrase), matched_documents)
+    vector_space = load_vector_space(collection, positional_index)
+    query_planner = QueryPlanner(positional_index, vector_space)
+    query_planner.query(StringIO(phrase), explain)
 
 
 def is_valid_file(path):
@@ -59,21 +77,24 @@ def main():
                    "[2] Print Positional Index\n"
                    "[3] Print Vector Space\n"
                    "[4] Phrase Query\n"
-                   "[5] Exit: ")
+                   "[5] Build Unified Index (postings, idf and document lengths only).\n"
+                   "[6] Explain Phrase Query\n"
+                   "[7] Exit: ")
 
     if select == "1":
         collection = input("Enter collection path: ")
         if not is_valid_file(collection):
             print("The collection not found!")
             return
-        index(collection)
+        stemming = input("Enable stemming? [y/N]: ").lower() == "y"
+        index(collection, stemming=stemming)
 
     elif select == "2":
         collection = input("Enter collection path: ")
         if not is_valid_file(collection):
             print("The collection not found!")
             return
-        if not is_valid_file(Path(collection) / "vector_space"):
+        if not is_valid_file(Path(collection) / "index"):
             print("The index not found, please build the index first.")
             return
         print_index(collection)
@@ -83,8 +104,8 @@ def main():
         if not is_valid_file(collection):
             print("The collection not found!")
             return
-        if not is_valid_file(Path(collection) / "index") or not is_valid_file(Path(collection) / "vector_space"):
-            print("The 'index' or 'vector_space' are not found, please build the index first.")
+        if not is_valid_file(Path(collection) / "index"):
+            print("The index not found, please build the index first.")
             return
         print_vector_space(collection)
 
@@ -93,12 +114,31 @@ def main():
         if not is_valid_file(collection):
             print("The collection not found!")
             return
-        if not is_valid_file(Path(collection) / "index") or not is_valid_file(Path(collection) / "vector_space"):
-            print("The 'index' or 'vector_space' are not found, please build the index first.")
+        if not is_valid_file(Path(collection) / "index"):
+            print("The index not found, please build the index first.")
             return
         phrase = input("Enter phrase: ")
         query(phrase, collection)
 
+    elif select == "5":
+        collection = input("Enter collection path: ")
+        if not is_valid_file(collection):
+            print("The collection not found!")
+            return
+        stemming = input("Enable stemming? [y/N]: ").lower() == "y"
+        index(collection, unified=True, stemming=stemming)
+
+    elif select == "6":
+        collection = input("Enter collection path: ")
+        if not is_valid_file(collection):
+            print("The collection not found!")
+            return
+        if not is_valid_file(Path(collection) / "index"):
+            print("The index not found, please build the index first.")
+            return
+        phrase = input("Enter phrase: ")
+        query(phrase, collection, explain=True)
+
     else:
         sys.exit()
 
@@ -2,6 +2,7 @@ import pickle
 from collections import OrderedDict
 from dataclasses import dataclass, field
 from io import StringIO
+from math import log10, sqrt
 from pathlib import Path
 
 from .document_collection import Document, DocumentCollection
@@ -88,7 +89,33 @@ class PostingsList:
     def __len__(self):
         return len(self.postings)
 
+    def get_posting(self, document: Document):
+        posting, _ = self.get_posting_with_cost(document)
+        return posting
+
+    def get_posting_with_cost(self, document: Document) -> tuple:
+        # binary search, the postings are sorted by the document id. the cost is the number of postings read
+        low = 0
+        high = len(self.postings)
+        cost = 0
+        while low < high:
+            middle = (low + high) // 2
+            document_id = self.postings[middle].document.document_id
+            cost += 1
+            if document_id == document.document_id:
+                return self.postings[middle], cost
+            if document_id < document.document_id:
+                low = middle + 1
+            else:
+                high = middle
+        return None, cost
+
     def get_intersect(self, other_postings_list, k: int) -> set:
+        result, _ = self.get_intersect_with_cost(other_postings_list, k)
+        return result
+
+    def get_intersect_with_cost(self, other_postings_list, k: int) -> tuple[set, int]:
+        # the cost is the number of postings walked by the merge
         posting_index = 0
         other_posting_index = 0
         postings = self.postings
@@ -112,14 +139,32 @@ class PostingsList:
                 other_posting_index += 1
             else:
                 posting_index += 1
-        return result
+        return result, posting_index + other_posting_index
+
+    def get_intersect_in_documents(self, other_postings_list, k: int, documents) -> tuple[set, int]:
+        # same as get_intersect_with_cost, but only the postings of the given documents are looked up
+        result = set()
+        cost = 0
+        for document in documents:
+            posting, posting_cost = self.get_posting_with_cost(document)
+            other_posting, other_posting_cost = other_postings_list.get_posting_with_cost(document)
+            cost += posting_cost + other_posting_cost
+            if posting is not None and other_posting is not None:
+                result = result.union(posting.get_candidate(other_posting, k))
+        return result, cost
 
     def get_postings(self) -> set:
+        result, _ = self.get_postings_with_cost()
+        return result
+
+    def get_postings_with_cost(self) -> tuple[set, int]:
         result = set()
+        cost = 0
         for posting in self.postings:
+            cost += 1
             for position in posting.positions:
                 result.add(Candidate(position, posting.document))
-        return result
+        return result, cost
 
     def print_postings(self):
         print("\n" + "*" * 25 + "Term" + "*" * 25)
@@ -135,6 +180,7 @@ class PositionalIndex:
     tokenizer: Tokenizer
     dictionary: OrderedDict[str, PostingsList]
     terms: OrderedDict[str, Term]
+    document_length: OrderedDict[Document, float]
 
     def __init__(self, tokenizer, document_collection):
         self.tokenizer = tokenizer
@@ -142,6 +188,35 @@ class PositionalIndex:
         self.get_dictionary()
         self.sort_postings()
         self.dictionary = OrderedDict(sorted(self.dictionary.items()))
+        self.get_terms_weights()
+
+    def get_terms_weights(self):
+        # only df, idf per term and one length per document are kept, tf-idf weights are derived from the postings
+        self.terms = OrderedDict()
+        self.document_length = OrderedDict.fromkeys(self.document_collection, 0)
+        for term, postings_list in self.dictionary.items():
+            df = len(postings_list.postings)
+            term_data = Term(df=df, idf=log10(self.number_of_documents / df))
+            for posting in postings_list.postings:
+                tf_idf = len(posting.positions) * term_data.idf
+                self.document_length[posting.document] = self.document_length[posting.document] + tf_idf ** 2
+            self.terms[term] = term_data
+
+        for document in self.document_length:
+            self.document_length[document] = sqrt(self.document_length[document])
+
+    def get_norm_tf_idf(self, term: str, document: Document) -> float:
+        norm_tf_idf, _ = self.get_norm_tf_idf_with_cost(term, document)
+        return norm_tf_idf
+
+    def get_norm_tf_idf_with_cost(self, term: str, document: Document) -> tuple[float, int]:
+        term_data = self.terms.get(term)
+        if term_data is None or not self.document_length.get(document):
+            return 0, 0
+        posting, cost = self.dictionary[term].get_posting_with_cost(document)
+        if posting is None:
+            return 0, cost
+        return len(posting.positions) * term_data.idf / self.document_length[document], cost
 
     def sort_postings(self):
         if self.document_collection.directory is not None:
@@ -162,13 +237,15 @@ class PositionalIndex:
                     postings_list.update(Token(term, i, document))
 
     def phrase_query(self, phrase: StringIO) -> set:
-        terms = self.tokenizer(phrase)
-        postings_lists = []
-        result = set()
+        return self.terms_query(list(self.tokenizer(phrase)))
+
+    def get_postings_lists(self, terms: list[str]) -> list[PostingsList]:
+        # terms that are not in the dictionary are dropped from the phrase
+        return [self.dictionary[term] for term in terms if term in self.dictionary]
 
-        for term in terms:
-            if self.dictionary.get(term) is not None:
-                postings_lists.append(self.dictionary.get(term))
+    def terms_query(self, terms: list[str]) -> set:
+        postings_lists = self.get_postings_lists(terms)
+        result = set()
         postings_lists_length = len(postings_lists)
 
         if postings_lists_length == 0:
@@ -186,7 +263,11 @@ class PositionalIndex:
     @classmethod
     def load(cls, path):
         with open(path, "rb") as file:
-            return pickle.load(file)
+            positional_index = pickle.load(file)
+        # indexes saved before the unified mode have no weights
+        if not hasattr(positional_index, "document_length"):
+            positional_index.get_terms_weights()
+        return positional_index
 
     def save(self, file_name):
         with open(Path(self.document_collection.directory) / file_name, "wb") as file:
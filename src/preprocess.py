@@ -1,7 +1,8 @@
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from abc import ABCMeta, abstractmethod
 from functools import partial
-from typing import Set
+from typing import List, Optional, Set
 from io import StringIO
 
 
@@ -57,17 +58,66 @@ class TokensScanner(Scanner):
             yield token
 
 
+class Filter(metaclass=ABCMeta):
+    # returns the analyzed term, or None to drop the token
+    @abstractmethod
+    def __call__(self, term: str) -> Optional[str]:
+        raise NotImplementedError
+
+
 @dataclass
-class Normalizer:
+class Normalizer(Filter):
     def __call__(self, token: str) -> str:
         terms = token.lower()
         return terms
 
 
 @dataclass
-class Tokenizer:
+class StopWordsFilter(Filter):
     stop_list: StopWords
-    normalizer: Normalizer
+
+    def __call__(self, term: str) -> Optional[str]:
+        if term in self.stop_list:
+            return None
+        return term
+
+
+_MISSING = object()
+
+
+@dataclass
+class Analyzer:
+    filters: List[Filter]
+    cache_size: int = field(default=100_000)
+    cache: OrderedDict = field(default_factory=OrderedDict, compare=False, repr=False)
+
+    def __call__(self, token: str) -> Optional[str]:
+        cache = self.cache
+        term = cache.get(token, _MISSING)
+        if term is not _MISSING:
+            cache.move_to_end(token)
+            return term
+
+        term = token
+        for token_filter in self.filters:
+            term = token_filter(term)
+            if term is None:
+                break
+        cache[token] = term
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return term
+
+    def __getstate__(self):
+        # only the configuration is saved with the index, the cache is rebuilt after loading
+        state = self.__dict__.copy()
+        state["cache"] = OrderedDict()
+        return state
+
+
+@dataclass
+class Tokenizer:
+    analyzer: Analyzer
     scanner: Scanner
     text: StringIO = field(default_factory=lambda: StringIO())
 
@@ -75,9 +125,16 @@ class Tokenizer:
         self.text = text
         return self
 
+    def __setstate__(self, state):
+        # indexes saved before the analyzer keep the stop list and the normalizer on the tokenizer
+        if "analyzer" not in state:
+            state["analyzer"] = Analyzer([state.pop("normalizer"), StopWordsFilter(state.pop("stop_list"))])
+        self.__dict__.update(state)
+
     def __iter__(self):
+        analyzer = self.analyzer
         for token in self.scanner(self.text):
-            term = self.normalizer(token)
-            if term in self.stop_list:
+            term = analyzer(token)
+            if term is None:
                 continue
             yield term
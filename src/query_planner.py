@@ -0,0 +1,141 @@
+from dataclasses import dataclass, field
+from io import StringIO
+from time import perf_counter
+from typing import Optional
+
+from texttable import Texttable
+
+from .positional_index import PositionalIndex, PostingsList
+from .vector_space import VectorSpace
+
+
+@dataclass
+class PlanStep:
+    operation: str
+    detail: str
+    estimated_postings: int
+    postings_list: Optional[PostingsList] = field(default=None, repr=False)
+    k: int = field(default=0)
+    actual_postings: int = field(default=0)
+    time: float = field(default=0.0)
+    skipped: bool = field(default=False)
+
+
+@dataclass
+class QueryPlan:
+    terms: list[str]
+    postings_lists: list[PostingsList]
+    steps: list[PlanStep] = field(default_factory=lambda: [])
+
+
+@dataclass
+class QueryPlanner:
+    positional_index: PositionalIndex
+    vector_space: VectorSpace
+
+    def query(self, phrase: StringIO, explain=False) -> set:
+        plan = self.plan(phrase)
+        candidates = self.execute(plan)
+        if explain:
+            self.print_plan(plan)
+        return candidates
+
+    def plan(self, phrase: StringIO) -> QueryPlan:
+        start = perf_counter()
+        terms = list(self.positional_index.tokenizer(phrase))
+        tokenize = PlanStep("tokenize", f"terms: {terms}", 0, time=perf_counter() - start)
+
+        start = perf_counter()
+        postings_lists = self.positional_index.get_postings_lists(terms)
+        dictionary = self.positional_index.dictionary
+        lookup_detail = ", ".join(f"{term}(df={len(dictionary[term]) if term in dictionary else 0})"
+                                  for term in terms)
+        lookup = PlanStep("lookup", lookup_detail, 0, time=perf_counter() - start)
+
+        plan = QueryPlan(terms, postings_lists, [tokenize, lookup])
+        start = perf_counter()
+        steps = self.get_execution_steps(plan)
+        order = ", ".join(step.postings_list.term for step in steps if step.operation == "intersect")
+        plan.steps.append(PlanStep("plan", f"rarest first: {order}" if order else "no intersection", 0,
+                                   time=perf_counter() - start))
+        plan.steps.extend(steps)
+        return plan
+
+    def get_execution_steps(self, plan):
+        postings_lists = plan.postings_lists
+        if not postings_lists:
+            return [PlanStep("short-circuit", "no query term is in the index", 0)]
+
+        first = postings_lists[0]
+        if len(postings_lists) == 1:
+            steps = [PlanStep("scan", f"all positions of '{first.term}'", len(first), first)]
+        else:
+            # every candidate is a position of the first term, so it anchors all the intersections.
+            # the rarest term is merged with it first, the next intersections only look up the
+            # postings of the documents that are still candidates.
+            intersections = sorted(enumerate(postings_lists[1:], 1), key=lambda item: len(item[1]))
+            k, postings_list = intersections[0]
+            steps = [PlanStep("intersect", f"merge '{first.term}' with '{postings_list.term}' at +{k}",
+                              len(first) + len(postings_list), postings_list, k)]
+            estimated_documents = min(len(first), len(postings_list))
+            for k, postings_list in intersections[1:]:
+                # a binary search in both postings lists for every candidate document
+                steps.append(PlanStep("intersect", f"look up '{first.term}' with '{postings_list.term}' at +{k} "
+                                                   f"in the candidate documents",
+                                      estimated_documents * (len(first).bit_length() +
+                                                             len(postings_list).bit_length()),
+                                      postings_list, k))
+                estimated_documents = min(estimated_documents, len(postings_list))
+
+        # one candidate per document, each position of the first term is a candidate of its own
+        estimated_documents = min(len(postings_list) for postings_list in postings_lists)
+        terms = {postings_list.term for postings_list in postings_lists}
+        steps.append(PlanStep("score", f"cosine similarity of {len(terms)} terms in the candidate documents",
+                              estimated_documents * sum(self.vector_space.estimate_norm_tf_idf_cost(term)
+                                                        for term in terms)))
+        steps.append(PlanStep("print", "query results", 0))
+        return steps
+
+    def execute(self, plan: QueryPlan) -> set:
+        candidates = None
+        query_results = []
+        first = plan.postings_lists[0] if plan.postings_lists else None
+        for step in plan.steps:
+            if step.operation in ("tokenize", "lookup", "plan"):
+                continue
+            if step.operation == "short-circuit":
+                candidates = set()
+                continue
+            if candidates is not None and not candidates:
+                step.skipped = True
+                continue
+
+            start = perf_counter()
+            if step.operation == "scan":
+                candidates, step.actual_postings = step.postings_list.get_postings_with_cost()
+            elif step.operation == "intersect":
+                if candidates is None:
+                    candidates, step.actual_postings = first.get_intersect_with_cost(step.postings_list, step.k)
+                else:
+                    documents = sorted({candidate.document for candidate in candidates})
+                    result, step.actual_postings = first.get_intersect_in_documents(step.postings_list, step.k,
+                                                                                     documents)
+                    candidates = candidates.intersection(result)
+            elif step.operation == "score":
+                query_results = self.vector_space.get_query_results(plan.terms, candidates)
+                step.actual_postings = sum(query_result.postings_read for _, query_result in query_results)
+            elif step.operation == "print":
+                self.vector_space.print_query(plan.terms, query_results)
+            step.time = perf_counter() - start
+        return candidates
+
+    @classmethod
+    def print_plan(cls, plan: QueryPlan):
+        print('*' * 50 + "\tQuery Plan\t" + '*' * 50)
+        plan_table = Texttable(max_width=200).set_precision(6)
+        plan_table.add_row(["Step", "Operation", "Detail", "Estimated postings", "Actual postings", "Time (ms)"])
+        for i, step in enumerate(plan.steps, 1):
+            operation = f"{step.operation} (skipped)" if step.skipped else step.operation
+            plan_table.add_row([i, operation, step.detail, step.estimated_postings, step.actual_postings,
+                                step.time * 1000])
+        print(plan_table.draw())
@@ -0,0 +1,139 @@
+import re
+from dataclasses import dataclass
+
+from .preprocess import Filter
+
+
+def group_by_last_letter(rules):
+    groups = {}
+    for suffix, replacement in sorted(rules, key=lambda rule: len(rule[0]), reverse=True):
+        groups.setdefault(suffix[-1], []).append((suffix, replacement))
+    return groups
+
+
+@dataclass
+class PorterStemmer(Filter):
+    # the rules are grouped by the last letter of the suffix and sorted by the suffix length, only the
+    # longest matching suffix is tried
+    step2_rules = group_by_last_letter((("ational", "ate"), ("tional", "tion"), ("enci", "ence"), ("anci", "ance"),
+                                        ("izer", "ize"), ("abli", "able"), ("alli", "al"), ("entli", "ent"),
+                                        ("eli", "e"), ("ousli", "ous"), ("ization", "ize"), ("ation", "ate"),
+                                        ("ator", "ate"), ("alism", "al"), ("iveness", "ive"), ("fulness", "ful"),
+                                        ("ousness", "ous"), ("aliti", "al"), ("iviti", "ive"), ("biliti", "ble")))
+    step3_rules = group_by_last_letter((("icate", "ic"), ("ative", ""), ("alize", "al"), ("iciti", "ic"),
+                                        ("ical", "ic"), ("ful", ""), ("ness", "")))
+    step4_rules = group_by_last_letter((("al", ""), ("ance", ""), ("ence", ""), ("er", ""), ("ic", ""),
+                                        ("able", ""), ("ible", ""), ("ant", ""), ("ement", ""), ("ment", ""),
+                                        ("ent", ""), ("ion", ""), ("ou", ""), ("ism", ""), ("ate", ""), ("iti", ""),
+                                        ("ous", ""), ("ive", ""), ("ize", "")))
+    consonants = re.compile("[^aeiouy]")
+    vowels = str.maketrans("aeiou", "vvvvv")
+
+    def __call__(self, term: str) -> str:
+        if len(term) <= 2:
+            return term
+        word = self.__step1a(term)
+        word = self.__step1b(word)
+        word = self.__step1c(word)
+        word = self.__replace(word, self.step2_rules, 0)
+        word = self.__replace(word, self.step3_rules, 0)
+        word = self.__step4(word)
+        word = self.__step5(word)
+        return word
+
+    @classmethod
+    def get_form(cls, word):
+        # 'c' for a consonant and 'v' for a vowel, 'y' is a vowel only after a consonant
+        form = cls.consonants.sub("c", word).translate(cls.vowels)
+        if "y" not in form:
+            return form
+        form = list(form)
+        for i, char in enumerate(form):
+            if char == "y":
+                form[i] = "v" if i and form[i - 1] == "c" else "c"
+        return "".join(form)
+
+    @classmethod
+    def measure(cls, form):
+        # number of vowel-consonant sequences in [C](VC){m}[V]
+        return form.count("vc")
+
+    @classmethod
+    def ends_double_consonant(cls, word, form):
+        return len(word) >= 2 and word[-1] == word[-2] and form[-1] == "c"
+
+    @classmethod
+    def ends_cvc(cls, word, form):
+        return form.endswith("cvc") and word[-1] not in "wxy"
+
+    @classmethod
+    def __replace(cls, word, rules, min_measure):
+        for suffix, replacement in rules.get(word[-1], ()):
+            if word.endswith(suffix):
+                stem_length = len(word) - len(suffix)
+                return word[:stem_length] + replacement if cls.measure(
+                    cls.get_form(word)[:stem_length]) > min_measure else word
+        return word
+
+    @classmethod
+    def __step1a(cls, word):
+        if word.endswith("sses") or word.endswith("ies"):
+            return word[:-2]
+        if word.endswith("ss"):
+            return word
+        if word.endswith("s"):
+            return word[:-1]
+        return word
+
+    @classmethod
+    def __step1b(cls, word):
+        if word.endswith("eed"):
+            return word[:-1] if cls.measure(cls.get_form(word)[:-3]) > 0 else word
+
+        for suffix in ("ed", "ing"):
+            if word.endswith(suffix) and "v" in cls.get_form(word)[:-len(suffix)]:
+                word = word[:-len(suffix)]
+                break
+        else:
+            return word
+
+        if word.endswith(("at", "bl", "iz")):
+            return word + "e"
+        form = cls.get_form(word)
+        if cls.ends_double_consonant(word, form) and word[-1] not in "lsz":
+            return word[:-1]
+        if cls.measure(form) == 1 and cls.ends_cvc(word, form):
+            return word + "e"
+        return word
+
+    @classmethod
+    def __step1c(cls, word):
+        if word.endswith("y") and "v" in cls.get_form(word)[:-1]:
+            return word[:-1] + "i"
+        return word
+
+    @classmethod
+    def __step4(cls, word):
+        for suffix, _ in cls.step4_rules.get(word[-1], ()):
+            if word.endswith(suffix):
+                stem = word[:-len(suffix)]
+                if cls.measure(cls.get_form(stem)) <= 1:
+                    return word
+                if suffix == "ion" and not stem.endswith(("s", "t")):
+                    return word
+                return stem
+        return word
+
+    @classmethod
+    def __step5(cls, word):
+        if word[-1] not in "el":
+            return word
+        form = cls.get_form(word)
+        if word.endswith("e"):
+            stem, stem_form = word[:-1], form[:-1]
+            m = cls.measure(stem_form)
+            if m > 1 or m == 1 and not cls.ends_cvc(stem, stem_form):
+                word, form = stem, stem_form
+        if cls.measure(form) > 1 and cls.ends_double_consonant(word, form) and word.endswith("l"):
+            word = word[:-1]
+        return word
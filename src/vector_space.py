@@ -1,12 +1,12 @@
 import pickle
 from math import log10, log, sqrt
 from collections import OrderedDict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import List
 from texttable import Texttable
 
-from .positional_index import Candidate
+from .positional_index import Candidate, PositionalIndex
 from .document_collection import Document, DocumentCollection
 from .preprocess import Tokenizer
 
@@ -37,6 +37,7 @@ class QueryResult:
     length: float
     cosine_similarity: float
     query_document_product: OrderedDict[str, OrderedDict[str, float]]
+    postings_read: int = field(default=0)
 
 
 @dataclass
@@ -144,8 +145,30 @@ class VectorSpace:
         }
         return switcher.get(data, "Invalid data")
 
+    def has_term(self, term):
+        return term in self.terms_in_documents
+
+    def get_df_idf(self, term):
+        return self.terms_in_documents[term].df, self.terms_in_documents[term].idf
+
+    def get_norm_tf_idf(self, term, document):
+        return self.terms_in_documents[term].norm_tf_idf[document]
+
+    def get_norm_tf_idf_with_cost(self, term, document):
+        # the weight is stored, so a single entry is read
+        return self.get_norm_tf_idf(term, document), 1
+
+    def estimate_norm_tf_idf_cost(self, term):
+        return 1
+
     def query(self, phrase, candidates):
-        query_phrase = list(self.tokenizer(phrase))
+        self.terms_query(list(self.tokenizer(phrase)), candidates)
+
+    def terms_query(self, query_phrase, candidates):
+        query_results = self.get_query_results(query_phrase, candidates)
+        self.print_query(query_phrase, query_results)
+
+    def get_query_results(self, query_phrase, candidates):
         query_results: List[(str, QueryResult)] = []
         query_result: QueryResult
 
@@ -158,7 +181,9 @@ class VectorSpace:
             query_result = self.__calculate_query_length(query_result)
             query_result = self.__calculate_cosine_similarity(query_result, candidate.document)
             query_results.append((candidate, query_result))
+        return query_results
 
+    def print_query(self, query_phrase, query_results):
         if query_results:
             self.__print_query_terms_data(query_results[0][1])
             self.__print_query_document_product(query_results, query_phrase)
@@ -170,11 +195,12 @@ class VectorSpace:
                 query_result.terms[term].tf += 1
                 query_result.terms[term].w_tf = 1.0 + log(query_result.terms[term].tf)
                 continue
-            if term in self.terms_in_documents:
+            if self.has_term(term):
+                df, idf = self.get_df_idf(term)
                 query_result.terms.update(
                     {term: TermData(tf=1,
-                                    df=self.terms_in_documents[term].df,
-                                    idf=self.terms_in_documents[term].idf,
+                                    df=df,
+                                    idf=idf,
                                     w_tf=1,
                                     tf_idf=0,
                                     norm_tf_idf=0)})
@@ -204,12 +230,12 @@ class VectorSpace:
 
     def __calculate_cosine_similarity(self, query_result, document):
         for term, term_data in query_result.terms.items():
-            if term in self.terms_in_documents.keys():
+            if self.has_term(term):
                 term_data.norm_tf_idf = term_data.tf_idf / query_result.length if query_result.length else 0
+                document_norm_tf_idf, cost = self.get_norm_tf_idf_with_cost(term, document)
+                query_result.postings_read += cost
                 query_result.query_document_product.update(
-                    {term: {
-                        document.document_path.name: term_data.norm_tf_idf * self.terms_in_documents[term].norm_tf_idf[
-                            document]}}
+                    {term: {document.document_path.name: term_data.norm_tf_idf * document_norm_tf_idf}}
                 )
                 query_result.cosine_similarity += query_result.query_document_product[term][document.document_path.name]
             else:
@@ -271,7 +297,6 @@ class VectorSpace:
             table.add_row(table_raw)
         print(table.draw())
 
-
     @classmethod
     def load(cls, path):
         with open(path, "rb") as file:
@@ -280,3 +305,35 @@ class VectorSpace:
     def save(self, file_name):
         with open(Path(self.document_collection.directory) / file_name, "wb") as file:
             pickle.dump(self, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+@dataclass
+class PostingsVectorSpace(VectorSpace):
+    positional_index: PositionalIndex = field(repr=False)
+
+    def __init__(self, positional_index):
+        self.positional_index = positional_index
+        self.document_collection = positional_index.document_collection
+        self.tokenizer = positional_index.tokenizer
+        self.terms_in_documents = None
+        self.document_length = positional_index.document_length
+
+    def has_term(self, term):
+        return term in self.positional_index.terms
+
+    def get_df_idf(self, term):
+        term_data = self.positional_index.terms[term]
+        return term_data.df, term_data.idf
+
+    def get_norm_tf_idf(self, term, document):
+        return self.positional_index.get_norm_tf_idf(term, document)
+
+    def get_norm_tf_idf_with_cost(self, term, document):
+        return self.positional_index.get_norm_tf_idf_with_cost(term, document)
+
+    def estimate_norm_tf_idf_cost(self, term):
+        # a binary search over the postings of the term
+        return len(self.positional_index.dictionary[term]).bit_length()
+
+    def print_vector_space(self):
+        VectorSpace(self.tokenizer, self.positional_index).print_vector_space()